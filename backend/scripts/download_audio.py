@@ -17,7 +17,7 @@ def download_audio(url, output_dir=None):
     
     Args:
         url (str): YouTube video URL
-        output_dir (str): Output directory (optional)
+        output_dir (str): Output directory (optional). Reuse it to resume an interrupted download
     
     Returns:
         str: Path to downloaded audio file
@@ -31,12 +31,16 @@ def download_audio(url, output_dir=None):
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
         # Configure yt-dlp options
+        # Whisper resamples to 16 kHz mono, so prefer the smallest stream that is still fine for speech
         ydl_opts = {
-            'format': 'bestaudio/best',
+            'format': 'bestaudio[abr<=64]/worstaudio[abr>=32]/worstaudio/best',
             'extractaudio': True,
             'audioformat': 'mp3',
-            'audioquality': '0',  # Best quality
-            'outtmpl': os.path.join(output_dir, 'audio.%(ext)s'),
+            # Partial downloads are only resumed when the caller passes the output_dir of an interrupted
+            # earlier call; the default temp dir is new each time. Naming files by video and format
+            # keeps a reused dir from resuming one stream with the bytes of another.
+            'continuedl': True,
+            'outtmpl': os.path.join(output_dir, 'audio.%(id)s.%(format_id)s.%(ext)s'),
             'noplaylist': True,
             'ignoreerrors': True,
             'quiet': True,
@@ -55,7 +59,7 @@ def download_audio(url, output_dir=None):
             
             # Find the downloaded file
             for file in os.listdir(output_dir):
-                if file.startswith('audio.'):
+                if file.startswith(f"audio.{info['id']}.") and not file.endswith('.part'):
                     audio_path = os.path.join(output_dir, file)
                     return audio_path
             
@@ -0,0 +1,81 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from sentence_transformers import util
+import torch
+from src.utils.logging_utils import setup_logger
+from typing import Any, Dict, Optional, Tuple
+
+logger = setup_logger(__name__)
+
+ANSWER_CACHE_THRESHOLD = float(os.environ.get("ANSWER_CACHE_THRESHOLD", 0.92))
+ANSWER_CACHE_MAX_ENTRIES = int(os.environ.get("ANSWER_CACHE_MAX_ENTRIES", 1024))
+
+def hash_text(text: str) -> str:
+    """Return a hash of a document's text for cache keys."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class SemanticAnswerCache:
+    """
+    LRU cache of answers keyed by document hash plus question embedding.
+    A lookup hits when a stored question for the same document has cosine similarity
+    at or above the threshold, so near-duplicate questions skip QA inference and translation.
+    """
+    def __init__(self, threshold: float = ANSWER_CACHE_THRESHOLD, max_entries: int = ANSWER_CACHE_MAX_ENTRIES) -> None:
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[torch.Tensor, str]]" = OrderedDict()
+        self._doc_index: Dict[str, Dict[Tuple[str, str], None]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._hit_similarity_total = 0.0
+
+    def lookup(self, doc_key: str, question: str, embedding: torch.Tensor) -> Optional[str]:
+        with self._lock:
+            exact_key = (doc_key, question.strip().lower())
+            if exact_key in self._entries:
+                return self._hit(exact_key, 1.0)
+            keys = list(self._doc_index.get(doc_key, {}))
+            if keys:
+                stored = torch.stack([self._entries[key][0] for key in keys])
+                similarities = util.cos_sim(embedding, stored)[0]
+                best = int(torch.argmax(similarities))
+                similarity = float(similarities[best])
+                if similarity >= self.threshold:
+                    return self._hit(keys[best], similarity)
+            self.misses += 1
+            return None
+
+    def _hit(self, key: Tuple[str, str], similarity: float) -> str:
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._hit_similarity_total += similarity
+        logger.info(f"Answer cache hit (similarity {similarity:.3f})")
+        return self._entries[key][1]
+
+    def store(self, doc_key: str, question: str, embedding: torch.Tensor, answer: str) -> None:
+        with self._lock:
+            key = (doc_key, question.strip().lower())
+            self._entries[key] = (embedding, answer)
+            self._entries.move_to_end(key)
+            self._doc_index.setdefault(doc_key, {})[key] = None
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                doc_keys = self._doc_index[old_key[0]]
+                doc_keys.pop(old_key, None)
+                if not doc_keys:
+                    del self._doc_index[old_key[0]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'mean_hit_similarity': self._hit_similarity_total / self.hits if self.hits else 0.0,
+                'threshold': self.threshold
+            }
@@ -1,24 +1,120 @@
-from src.utils.concurrency import run_concurrent_tasks
-from src.transcriber import get_transcript_or_transcribe
-from src.summarizer import summarize_transcript
+import time
+import concurrent.futures
+from src.utils.concurrency import run_concurrent_tasks, iter_concurrent_tasks
+from src.downloader import get_video_info
+from src.transcriber import get_transcript_with_tier, has_youtube_transcript
+from src.summarizer import summarize_transcript_chunks, merge_chunk_summaries, extractive_summary
 from src.translator import translate_text, detect_language
 from src.qa_engine import answer_question
+from src.corpus_index import index_document
+from src.utils.media import extract_video_id
+from src.job_journal import JobJournal
+from src.deadline import DeadlineScheduler
 from src.utils.logging_utils import setup_logger
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
 
 logger = setup_logger(__name__)
 
-def process_single_video(url: str, target_language: str, use_gpu: bool = True) -> Dict[str, Any]:
+# Relative cost per second of video. Caption transcripts only pay for summarization,
+# the Whisper fallback pays for download and transcription as well.
+CAPTION_COST_PER_SECOND = 0.1
+WHISPER_COST_PER_SECOND = 1.0
+# Duration assumed when video info cannot be fetched, so unknown videos are not starved.
+DEFAULT_DURATION_SECONDS = 600
+
+def get_video_duration(url: str) -> float:
+    try:
+        return float(get_video_info(url)['duration'] or DEFAULT_DURATION_SECONDS)
+    except Exception as e:
+        logger.warning(f"Could not get duration for {url}, assuming default: {e}")
+        return DEFAULT_DURATION_SECONDS
+
+def estimate_video_cost(url: str) -> float:
+    """Estimate the relative processing cost of a video from its duration and caption availability."""
+    duration = get_video_duration(url)
+    rate = CAPTION_COST_PER_SECOND if has_youtube_transcript(url) else WHISPER_COST_PER_SECOND
+    return duration * rate
+
+def schedule_longest_first(video_urls: List[str], max_workers: int = 4) -> List[str]:
+    """Order videos by descending estimated cost to shorten the total wall-clock time of a batch."""
+    # When every video gets a worker right away, order cannot help and estimation only delays the first result
+    if len(video_urls) <= max_workers:
+        return list(video_urls)
+    estimates = run_concurrent_tasks(estimate_video_cost, [(url,) for url in video_urls], max_workers=max_workers)
+    costs = {args[0]: (cost if isinstance(cost, float) else 0.0) for args, cost in estimates}
+    ordered = sorted(video_urls, key=lambda url: costs.get(url, 0.0), reverse=True)
+    logger.info(f"Scheduled {len(ordered)} videos longest-first")
+    return ordered
+
+def run_stage(journal: Optional[JobJournal], url: str, stage: str, compute: Callable[[], Any], scheduler: Optional[DeadlineScheduler] = None) -> Any:
+    """Return the journaled output of a stage, computing and recording it if it has not finished yet.
+    Outputs produced after a degraded tier are not journaled, so a later run with more time redoes them."""
+    if journal is None:
+        return compute()
+    value = journal.load(url, stage)
+    if value is not None:
+        logger.info(f"Resuming {url}: {stage} already done")
+        return value
+    value = compute()
+    if scheduler is None or not scheduler.degraded:
+        journal.save(url, stage, value)
+        if scheduler is not None:
+            journal.save(url, 'tiers', scheduler.tiers)
+    return value
+
+# Corpus indexing is off the response path: one background worker embeds transcripts after results are returned
+_indexing_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="corpus-index")
+
+def _index_transcript(url: str, transcript: str, use_gpu: bool) -> None:
+    try:
+        index_document(f"youtube:{extract_video_id(url)}", transcript, source=url, use_gpu=use_gpu)
+    except Exception as e:
+        logger.warning(f"Could not add {url} to corpus index: {e}")
+
+def wait_for_indexing() -> None:
+    """Block until every transcript queued so far has been added to the corpus index."""
+    _indexing_executor.submit(lambda: None).result()
+
+def process_single_video(url: str, target_language: str, use_gpu: bool = True, journal: Optional[JobJournal] = None, deadline_at: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Transcribe, summarize and translate one video. With deadline_at (a time.monotonic() value) set,
+    cheaper tiers are picked as the deadline approaches; result['tiers'] reports the tier used for each stage.
+    """
     logger.info(f"Processing video: {url}")
+    scheduler = DeadlineScheduler(deadline_at)
     try:
-        transcript = get_transcript_or_transcribe(url, use_gpu=use_gpu)
-        summary = summarize_transcript(transcript, use_gpu=use_gpu)
-        translated_summary = translate_text(summary, target_language, use_gpu=use_gpu)
+        if journal is not None:
+            scheduler.tiers.update(journal.load(url, 'tiers') or {})
+        def transcript_stage() -> str:
+            transcript, tier = get_transcript_with_tier(url, use_gpu=use_gpu, choose_whisper_model=lambda: scheduler.choose_whisper_model(get_video_duration(url)))
+            scheduler.record('transcript', tier)
+            return transcript
+
+        def summarization_stage() -> List[str]:
+            tier = scheduler.choose_summarization(len(transcript))
+            scheduler.record('summarization', tier)
+            if tier == 'extractive':
+                return [extractive_summary(transcript)]
+            return summarize_transcript_chunks(transcript, use_gpu=use_gpu)
+
+        def translation_stage() -> str:
+            if not scheduler.should_translate():
+                scheduler.record('translation', 'skipped')
+                return summary
+            scheduler.record('translation', 'translated')
+            return translate_text(summary, target_language, use_gpu=use_gpu)
+
+        transcript = run_stage(journal, url, 'transcript', transcript_stage, scheduler)
+        chunk_summaries = run_stage(journal, url, 'chunk_summaries', summarization_stage, scheduler)
+        summary = run_stage(journal, url, 'summary', lambda: merge_chunk_summaries(chunk_summaries, use_gpu=use_gpu), scheduler)
+        translated_summary = run_stage(journal, url, 'translation', translation_stage, scheduler)
+        _indexing_executor.submit(_index_transcript, url, transcript, use_gpu)
         return {
             'url': url,
             'transcript_snippet': transcript[:500],
             'summary': summary,
             'translated_summary': translated_summary,
+            'tiers': scheduler.tiers,
             'error': None
         }
     except Exception as e:
@@ -27,10 +123,21 @@ def process_single_video(url: str, target_language: str, use_gpu: bool = True) -
             'transcript_snippet': '',
             'summary': '',
             'translated_summary': '',
+            'tiers': scheduler.tiers,
             'error': str(e)
         }
 
-def process_videos(video_urls: List[str], target_language: str, use_gpu: bool = True, max_workers: int = 4) -> List[Tuple[Any, Dict[str, Any]]]:
-    task_args_list = [(url, target_language, use_gpu) for url in video_urls]
-    results = run_concurrent_tasks(process_single_video, task_args_list, max_workers=max_workers)
-    return results 
\ No newline at end of file
+def stream_videos(video_urls: List[str], target_language: str, use_gpu: bool = True, max_workers: int = 4, journal: Optional[JobJournal] = None, batch_deadline_seconds: Optional[float] = None) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """Process videos longest-first and yield each (args, result) pair as soon as it is ready.
+    batch_deadline_seconds is a single deadline for the whole batch, counted from this call: every video
+    shares it, so videos that wait longer for a worker get less time and may drop to cheaper tiers."""
+    deadline_at = None if batch_deadline_seconds is None else time.monotonic() + batch_deadline_seconds
+    finished = [url for url in video_urls if journal and journal.is_complete(url)]
+    pending = [url for url in video_urls if url not in finished]
+    # Fully journaled videos only need to be read back, so they go first and skip cost estimation
+    ordered_urls = finished + schedule_longest_first(pending, max_workers=max_workers)
+    task_args_list = [(url, target_language, use_gpu, journal, deadline_at) for url in ordered_urls]
+    return iter_concurrent_tasks(process_single_video, task_args_list, max_workers=max_workers)
+
+def process_videos(video_urls: List[str], target_language: str, use_gpu: bool = True, max_workers: int = 4, journal: Optional[JobJournal] = None, batch_deadline_seconds: Optional[float] = None) -> List[Tuple[Any, Dict[str, Any]]]:
+    return list(stream_videos(video_urls, target_language, use_gpu=use_gpu, max_workers=max_workers, journal=journal, batch_deadline_seconds=batch_deadline_seconds))
@@ -0,0 +1,288 @@
+import os
+import re
+import json
+import fcntl
+import threading
+from contextlib import contextmanager
+import numpy as np
+from src.utils.logging_utils import setup_logger
+from src.utils.paths import DATA_DIR
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = setup_logger(__name__)
+
+CORPUS_INDEX_DIR = os.environ.get("CORPUS_INDEX_DIR", os.path.join(DATA_DIR, "corpus"))
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+SHARD_SIZE = 65536
+PASSAGE_MAX_CHARS = 500
+# Below this many passages a full vectorized scan is fast enough; above it, cluster for IVF search
+IVF_MIN_PASSAGES = 50000
+
+def split_passages(text: str, max_chars: int = PASSAGE_MAX_CHARS) -> List[str]:
+    """Split text into sentence-aligned passages of at most max_chars characters."""
+    sentences = re.split(r'(?<=[.!?])\s+', re.sub(r'\s+', ' ', text).strip())
+    passages: List[str] = []
+    current = ""
+    for sentence in sentences:
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip()
+        while len(current) > max_chars:
+            passages.append(current[:max_chars])
+            current = current[max_chars:]
+    if current:
+        passages.append(current)
+    return passages
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+class CorpusIndex:
+    """
+    Persistent, append-only passage index across every processed video and PDF.
+    Unit-normalized float32 embeddings live in fixed-size memory-mapped shards (shard_NNNNN.f32),
+    passage metadata in a JSON-lines sidecar read on demand by byte offset.
+    Search is a vectorized scan over the shards, or an IVF scan over the nprobe closest
+    clusters once build_ivf has been run. Writers in different processes are serialized with
+    an fcntl lock on the directory, and every reader picks up rows appended by other processes.
+    """
+    def __init__(self, root_dir: str = CORPUS_INDEX_DIR, dim: int = EMBEDDING_DIM, shard_size: int = SHARD_SIZE) -> None:
+        self.root_dir = root_dir
+        self.dim = dim
+        self.shard_size = shard_size
+        self.metadata_path = os.path.join(root_dir, 'metadata.jsonl')
+        self.centroids_path = os.path.join(root_dir, 'ivf_centroids.npy')
+        self.assignments_path = os.path.join(root_dir, 'ivf_lists.i32')
+        self.lock_path = os.path.join(root_dir, '.lock')
+        self._lock = threading.Lock()
+        os.makedirs(root_dir, exist_ok=True)
+        self._load()
+
+    def _shard_path(self, shard: int) -> str:
+        return os.path.join(self.root_dir, f"shard_{shard:05d}.f32")
+
+    def _load(self) -> None:
+        self._offsets: List[int] = []
+        self._metadata_end = 0
+        self.doc_ids = set()
+        self.size = 0
+        self.centroids: Optional[np.ndarray] = None
+        self._centroids_mtime = 0.0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Pick up passages and IVF centroids written since the last refresh, possibly by another process."""
+        if os.path.exists(self.metadata_path):
+            if os.path.getsize(self.metadata_path) < self._metadata_end:
+                self._load()
+                return
+            with open(self.metadata_path, 'rb') as f:
+                f.seek(self._metadata_end)
+                for line in f:
+                    # A line without its newline is an append still in progress, or one cut short by a crash
+                    if not line.endswith(b'\n'):
+                        break
+                    self._offsets.append(self._metadata_end)
+                    self.doc_ids.add(json.loads(line)['doc_id'])
+                    self._metadata_end += len(line)
+        vector_rows = 0
+        shard = 0
+        while os.path.exists(self._shard_path(shard)):
+            vector_rows += os.path.getsize(self._shard_path(shard)) // (self.dim * 4)
+            shard += 1
+        # Vectors are written before metadata, so a crash mid-append can leave extra vector rows; ignore them
+        self.size = min(len(self._offsets), vector_rows)
+        if os.path.exists(self.centroids_path) and os.path.getmtime(self.centroids_path) != self._centroids_mtime:
+            self._centroids_mtime = os.path.getmtime(self.centroids_path)
+            self.centroids = np.load(self.centroids_path)
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """Serialize writers across threads and processes, and bring in-memory state up to date first."""
+        with self._lock, open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def contains(self, doc_id: str) -> bool:
+        """Whether doc_id has been indexed, by this or any other process."""
+        with self._lock:
+            self.refresh()
+            return doc_id in self.doc_ids
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _shard(self, shard: int) -> np.ndarray:
+        rows = min(self.shard_size, self.size - shard * self.shard_size)
+        return np.memmap(self._shard_path(shard), dtype=np.float32, mode='r', shape=(rows, self.dim))
+
+    def _truncate_shard(self, shard: int, rows: int) -> None:
+        path = self._shard_path(shard)
+        if os.path.exists(path) and os.path.getsize(path) > rows * self.dim * 4:
+            with open(path, 'r+b') as f:
+                f.truncate(rows * self.dim * 4)
+
+    def add(self, embeddings: np.ndarray, metadata: List[Dict[str, Any]]) -> None:
+        """Append passages. Each metadata dict must include 'doc_id' and 'text'.
+        Passages of documents that are already indexed are skipped."""
+        vectors = _normalize(embeddings).reshape(-1, self.dim)
+        if len(vectors) != len(metadata):
+            raise ValueError(f"Got {len(vectors)} embeddings for {len(metadata)} passages")
+        with self._write_lock():
+            new = [i for i, item in enumerate(metadata) if item['doc_id'] not in self.doc_ids]
+            if not new:
+                return
+            vectors = vectors[new]
+            metadata = [metadata[i] for i in new]
+            start = self.size
+            written = 0
+            while written < len(vectors):
+                row = start + written
+                shard, offset = divmod(row, self.shard_size)
+                self._truncate_shard(shard, offset)
+                count = min(len(vectors) - written, self.shard_size - offset)
+                with open(self._shard_path(shard), 'ab') as f:
+                    f.write(vectors[written:written + count].tobytes())
+                written += count
+            if self.centroids is not None:
+                self._append_assignments(start, vectors)
+            with open(self.metadata_path, 'ab') as f:
+                # Drop a partial trailing line left by an interrupted append
+                f.truncate(self._metadata_end)
+                f.write(b''.join((json.dumps(item) + '\n').encode('utf-8') for item in metadata))
+            self.refresh()
+
+    def _append_assignments(self, start: int, vectors: np.ndarray) -> None:
+        existing = os.path.getsize(self.assignments_path) // 4 if os.path.exists(self.assignments_path) else 0
+        if existing > start:
+            with open(self.assignments_path, 'r+b') as f:
+                f.truncate(start * 4)
+            existing = start
+        if existing < start:
+            vectors = np.concatenate([self._gather(np.arange(existing, start)), vectors])
+        lists = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+        with open(self.assignments_path, 'ab') as f:
+            f.write(lists.tobytes())
+
+    def build_ivf(self, n_lists: int = 256, iterations: int = 10, sample_size: int = 50000, seed: int = 0) -> None:
+        """Train spherical k-means centroids on a sample and assign every passage to its nearest cluster."""
+        with self._write_lock():
+            if self.size == 0:
+                return
+            n_lists = min(n_lists, self.size)
+            rng = np.random.default_rng(seed)
+            sample_ids = np.sort(rng.choice(self.size, size=min(sample_size, self.size), replace=False))
+            sample = self._gather(sample_ids)
+            centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for i in range(n_lists):
+                    members = sample[labels == i]
+                    if len(members):
+                        centroids[i] = members.sum(axis=0)
+                centroids = _normalize(centroids)
+            assignments = np.concatenate([
+                np.argmax(self._shard(shard) @ centroids.T, axis=1).astype(np.int32)
+                for shard in range(self._shard_count())
+            ])
+            assignments.tofile(self.assignments_path)
+            np.save(self.centroids_path, centroids)
+            self.centroids = centroids
+            self._centroids_mtime = os.path.getmtime(self.centroids_path)
+            logger.info(f"Built IVF index with {n_lists} lists over {self.size} passages")
+
+    def _shard_count(self) -> int:
+        return (self.size + self.shard_size - 1) // self.shard_size
+
+    def _gather(self, ids: np.ndarray) -> np.ndarray:
+        """Read the vectors for sorted row ids, touching only the shards that hold them."""
+        shards = ids // self.shard_size
+        parts = [np.asarray(self._shard(int(shard))[ids[shards == shard] % self.shard_size]) for shard in np.unique(shards)]
+        return np.concatenate(parts) if parts else np.empty((0, self.dim), dtype=np.float32)
+
+    def _candidates(self, query: np.ndarray, nprobe: int) -> Optional[np.ndarray]:
+        if self.centroids is None or not os.path.exists(self.assignments_path):
+            return None
+        assignments = np.memmap(self.assignments_path, dtype=np.int32, mode='r')[:self.size]
+        probe = np.argsort(self.centroids @ query)[-nprobe:]
+        return np.nonzero(np.isin(assignments, probe))[0]
+
+    def search(self, query_embedding: np.ndarray, top_k: int = 5, nprobe: int = 8) -> List[Dict[str, Any]]:
+        """Return the top_k passages by cosine similarity, each as its metadata dict plus 'score'."""
+        with self._lock:
+            self.refresh()
+        if self.size == 0:
+            return []
+        query = _normalize(query_embedding).reshape(self.dim)
+        candidates = self._candidates(query, nprobe)
+        if candidates is None:
+            ids_parts, score_parts = [], []
+            for shard in range(self._shard_count()):
+                scores = self._shard(shard) @ query
+                keep = np.argpartition(scores, -min(top_k, len(scores)))[-top_k:]
+                ids_parts.append(keep + shard * self.shard_size)
+                score_parts.append(scores[keep])
+            ids, scores = np.concatenate(ids_parts), np.concatenate(score_parts)
+        else:
+            ids = candidates
+            scores = self._gather(ids) @ query
+        order = np.argsort(-scores)[:top_k]
+        return [dict(self._metadata(int(ids[i])), score=float(scores[i])) for i in order]
+
+    def _metadata(self, row: int) -> Dict[str, Any]:
+        with open(self.metadata_path, 'rb') as f:
+            f.seek(self._offsets[row])
+            return json.loads(f.readline())
+
+_default_index: Optional[CorpusIndex] = None
+_default_lock = threading.Lock()
+
+def get_corpus_index() -> CorpusIndex:
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = CorpusIndex()
+        return _default_index
+
+def index_document(doc_id: str, text: str, source: str, title: str = "", use_gpu: bool = True, index: Optional[CorpusIndex] = None) -> int:
+    """Embed a processed document's passages into the corpus index. Returns the number of passages added.
+    Builds the IVF clusters once the corpus is large enough for a full scan to get slow."""
+    from src.qa_engine import get_qa_model
+    index = index or get_corpus_index()
+    if index.contains(doc_id):
+        return 0
+    passages = split_passages(text)
+    if not passages:
+        return 0
+    embeddings = get_qa_model(use_gpu=use_gpu).embed_batcher.map(passages)
+    vectors = np.stack([embedding.cpu().numpy() for embedding in embeddings])
+    index.add(vectors, [{'doc_id': doc_id, 'source': source, 'title': title, 'text': passage} for passage in passages])
+    logger.info(f"Indexed {len(passages)} passages from {source}")
+    if index.centroids is None and len(index) >= IVF_MIN_PASSAGES:
+        index.build_ivf()
+    return len(passages)
+
+def ask_corpus(question: str, target_language: str = 'en', use_gpu: bool = True, top_k: int = 5, index: Optional[CorpusIndex] = None) -> Dict[str, Any]:
+    """Answer a question across every indexed document. Returns the answer and the passages it was drawn from."""
+    from src.qa_engine import get_qa_model
+    from src.translator import translate_text, detect_language
+    index = index or get_corpus_index()
+    qa = get_qa_model(use_gpu=use_gpu)
+    # The embedder and QA model are English-only, as in QAModel.answer
+    question_en = translate_text(question, 'en', use_gpu=use_gpu) if detect_language(question) != 'en' else question
+    query = qa.embed_batcher.submit(question_en).result().cpu().numpy()
+    hits = index.search(query, top_k=top_k)
+    if not hits:
+        return {'answer': '', 'sources': []}
+    context = ' '.join(hit['text'] for hit in hits)
+    answer = qa.qa_batcher.submit({'context': context, 'question': question_en}).result()['answer']
+    if target_language != 'en':
+        answer = translate_text(answer, target_language, use_gpu=use_gpu)
+    return {'answer': answer, 'sources': hits}
@@ -0,0 +1,61 @@
+import math
+import time
+from src.utils.logging_utils import setup_logger
+from typing import Dict, Optional
+
+logger = setup_logger(__name__)
+
+# Rough CPU (int8) costs used to pick tiers. They only need to be right to within a factor of two.
+WHISPER_SECONDS_PER_AUDIO_SECOND = {'base': 0.5, 'tiny': 0.15}
+SPEECH_CHARS_PER_SECOND = 15
+ABSTRACTIVE_SECONDS_PER_CHUNK = 4.0
+CHUNK_STRIDE_CHARS = 900  # max_chunk_size - overlap in TranscriptSummarizer
+TRANSLATION_SECONDS = 2.0
+
+def estimate_chunk_count(text_length: int) -> int:
+    # One extra call for merging the chunk summaries
+    chunks = max(1, math.ceil(text_length / CHUNK_STRIDE_CHARS))
+    return chunks + 1 if chunks > 1 else chunks
+
+# Tiers below full quality. Their outputs are returned but never journaled as finished stages.
+DEGRADED_TIERS = {'whisper-tiny', 'extractive', 'skipped'}
+
+class DeadlineScheduler:
+    """
+    Tracks a request deadline (shared by every video in a batch) across stages and picks the best tier that still fits the remaining time:
+    Whisper base over tiny, abstractive over extractive summarization, and translation over skipping it.
+    Each chosen tier is recorded in tiers so the response can report how it was produced.
+    deadline_at is an absolute time.monotonic() value; None always picks the full-quality tier.
+    """
+    def __init__(self, deadline_at: Optional[float] = None) -> None:
+        self.deadline_at = deadline_at
+        self.tiers: Dict[str, str] = {}
+
+    def remaining(self) -> float:
+        if self.deadline_at is None:
+            return math.inf
+        return self.deadline_at - time.monotonic()
+
+    @property
+    def degraded(self) -> bool:
+        return any(tier in DEGRADED_TIERS for tier in self.tiers.values())
+
+    def record(self, stage: str, tier: str) -> None:
+        self.tiers[stage] = tier
+        if self.deadline_at is not None:
+            logger.info(f"{stage}: {tier} ({self.remaining():.1f}s left before the deadline)")
+
+    def choose_whisper_model(self, duration_seconds: float) -> str:
+        # Leave room for abstractive summarization and translation of the resulting transcript
+        later_stages = estimate_chunk_count(int(duration_seconds * SPEECH_CHARS_PER_SECOND)) * ABSTRACTIVE_SECONDS_PER_CHUNK + TRANSLATION_SECONDS
+        if duration_seconds * WHISPER_SECONDS_PER_AUDIO_SECOND['base'] + later_stages <= self.remaining():
+            return 'base'
+        return 'tiny'
+
+    def choose_summarization(self, text_length: int) -> str:
+        if estimate_chunk_count(text_length) * ABSTRACTIVE_SECONDS_PER_CHUNK + TRANSLATION_SECONDS <= self.remaining():
+            return 'abstractive'
+        return 'extractive'
+
+    def should_translate(self) -> bool:
+        return TRANSLATION_SECONDS <= self.remaining()
@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from src.utils.logging_utils import setup_logger
+from src.utils.paths import DATA_DIR
+from typing import Any, Dict, List, Optional
+
+logger = setup_logger(__name__)
+
+JOB_DIR = os.environ.get("JOB_DIR", os.path.join(DATA_DIR, "jobs"))
+VIDEO_STAGES = ['transcript', 'chunk_summaries', 'summary', 'translation']
+
+class JobJournal:
+    """
+    On-disk journal for a batch job. Each finished stage of each video (transcript, chunk summaries,
+    final summary, translation) is written atomically to <job_dir>/<url hash>/<stage>.json,
+    so a restarted job only runs the stages that are still missing. Entries are keyed by a hash of
+    the URL rather than its video ID, so malformed URLs can be journaled without parsing them.
+    """
+    def __init__(self, job_id: str, root_dir: str = JOB_DIR) -> None:
+        self.job_id = job_id
+        self.job_dir = os.path.join(root_dir, job_id)
+        self.manifest_path = os.path.join(self.job_dir, 'manifest.json')
+
+    @classmethod
+    def create(cls, video_urls: List[str], target_language: str, use_gpu: bool, job_id: Optional[str] = None, root_dir: str = JOB_DIR) -> "JobJournal":
+        journal = cls(job_id or uuid.uuid4().hex[:12], root_dir=root_dir)
+        os.makedirs(journal.job_dir, exist_ok=True)
+        _write_json(journal.manifest_path, {
+            'video_urls': video_urls,
+            'target_language': target_language,
+            'use_gpu': use_gpu,
+            'created_at': datetime.now(timezone.utc).isoformat()
+        })
+        logger.info(f"Created job {journal.job_id} for {len(video_urls)} videos")
+        return journal
+
+    @classmethod
+    def open(cls, job_id: str, root_dir: str = JOB_DIR) -> "JobJournal":
+        journal = cls(job_id, root_dir=root_dir)
+        if not os.path.exists(journal.manifest_path):
+            raise FileNotFoundError(f"No job journal found for {job_id} in {root_dir}")
+        return journal
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _stage_path(self, url: str, stage: str) -> str:
+        url_key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.job_dir, url_key, f"{stage}.json")
+
+    def load(self, url: str, stage: str) -> Optional[Any]:
+        path = self._stage_path(url, stage)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['value']
+
+    def save(self, url: str, stage: str, value: Any) -> None:
+        path = self._stage_path(url, stage)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_json(path, {'value': value})
+
+    def is_complete(self, url: str) -> bool:
+        return all(os.path.exists(self._stage_path(url, stage)) for stage in VIDEO_STAGES)
+
+    def pending_stages(self, url: str) -> List[str]:
+        return [stage for stage in VIDEO_STAGES if not os.path.exists(self._stage_path(url, stage))]
+
+    def delete(self) -> None:
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+        logger.info(f"Deleted journal of finished job {self.job_id}")
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    # A unique temp file per write, so two workers saving the same stage cannot collide
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(path), suffix='.tmp', delete=False) as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f.name, path)
@@ -1,6 +1,9 @@
+import os
 import sys
-from src.batch_processor import process_videos
-from src.qa_engine import answer_question
+from src.batch_processor import stream_videos, wait_for_indexing
+from src.job_journal import JobJournal
+from src.qa_engine import answer_question, answer_cache_stats
+from src.corpus_index import ask_corpus, get_corpus_index
 from src.utils.logging_utils import setup_logger
 from src.utils.error_handling import SummarizerError
 from rich.console import Console
@@ -12,6 +15,9 @@ logger = setup_logger(__name__)
 console = Console()
 
 MAX_VIDEOS = 20
+# Optional time budget for the whole batch, counted from submission. Videos still queued or running
+# as it runs out are switched to cheaper processing tiers, so size it for MAX_VIDEOS / workers rounds.
+BATCH_DEADLINE_SECONDS = float(os.environ["VIDEO_BATCH_DEADLINE_SECONDS"]) if os.environ.get("VIDEO_BATCH_DEADLINE_SECONDS") else None
 
 def get_user_inputs() -> Tuple[List[str], str, bool]:
     urls: List[str] = []
@@ -34,6 +40,8 @@ def display_summary(result: dict, idx: int) -> None:
     table.add_column("Transcript Snippet", style="cyan")
     table.add_column("Summary", style="green")
     table.add_row(result['transcript_snippet'][:500] + '...', result['translated_summary'])
+    if result.get('tiers'):
+        table.caption = ", ".join(f"{stage}: {tier}" for stage, tier in result['tiers'].items())
     console.print(table)
 
 def interactive_qa_loop(summary: str, target_language: str, use_gpu: bool) -> None:
@@ -41,6 +49,10 @@ def interactive_qa_loop(summary: str, target_language: str, use_gpu: bool) -> No
     while True:
         question = Prompt.ask("[bold blue]Your question[/bold blue]")
         if question.strip().lower() in ['exit', 'quit', 'q']:
+            stats = answer_cache_stats(use_gpu)
+            if stats:
+                logger.info(f"Answer cache: {stats['hits']} hits, {stats['misses']} misses, "
+                            f"hit rate {stats['hit_rate']:.0%}, mean hit similarity {stats['mean_hit_similarity']:.3f}")
             break
         try:
             answer = answer_question(summary, question, target_language, use_gpu=use_gpu)
@@ -48,13 +60,43 @@ def interactive_qa_loop(summary: str, target_language: str, use_gpu: bool) -> No
         except Exception as e:
             console.print(f"[red]Error answering question: {e}[/red]")
 
+def corpus_qa_loop(target_language: str, use_gpu: bool) -> None:
+    if not len(get_corpus_index()):
+        return
+    console.print("[bold yellow]Ask questions across everything processed so far (type 'exit' to quit):[/bold yellow]")
+    while True:
+        question = Prompt.ask("[bold blue]Library question[/bold blue]")
+        if question.strip().lower() in ['exit', 'quit', 'q']:
+            break
+        try:
+            result = ask_corpus(question, target_language, use_gpu=use_gpu)
+            console.print(f"[bold green]Answer:[/bold green] {result['answer']}")
+            for source in {hit['source'] for hit in result['sources']}:
+                console.print(f"[cyan]  from {source}[/cyan]")
+        except Exception as e:
+            console.print(f"[red]Error answering question: {e}[/red]")
+
 def main() -> None:
-    video_urls, target_language, use_gpu = get_user_inputs()
-    console.print(f"[bold]Processing {len(video_urls)} video(s) with target language: {target_language}[/bold]")
+    if len(sys.argv) == 3 and sys.argv[1] == '--resume':
+        try:
+            journal = JobJournal.open(sys.argv[2])
+        except FileNotFoundError as e:
+            console.print(f"[red]{e}[/red]")
+            sys.exit(1)
+        manifest = journal.manifest
+        video_urls, target_language, use_gpu = manifest['video_urls'], manifest['target_language'], manifest['use_gpu']
+        console.print(f"[bold]Resuming job {journal.job_id}: {len(video_urls)} video(s)[/bold]")
+    else:
+        video_urls, target_language, use_gpu = get_user_inputs()
+        journal = JobJournal.create(video_urls, target_language, use_gpu)
+        console.print(f"[bold]Processing {len(video_urls)} video(s) with target language: {target_language}[/bold]")
+        console.print(f"[yellow]Job {journal.job_id}: if interrupted, continue with --resume {journal.job_id}[/yellow]")
     try:
         from src.translator import detect_language
-        results = process_videos(video_urls, target_language, use_gpu=use_gpu, max_workers=min(4, len(video_urls)))
-        for idx, (task_args, result) in enumerate(results):
+        # Results arrive as each video finishes, so Q&A on the first one can start while the rest are still processing
+        # Finished stages are read back from the job journal instead of being recomputed
+        results = stream_videos(video_urls, target_language, use_gpu=use_gpu, max_workers=min(4, len(video_urls)), journal=journal, batch_deadline_seconds=BATCH_DEADLINE_SECONDS)
+        for task_args, result in results:
             if isinstance(result, Exception):
                 console.print(f"[red]Error processing video {task_args[0]}: {result}[/red]")
                 continue
@@ -70,8 +112,13 @@ def main() -> None:
                 else:
                     console.print("[red]Could not auto-detect language, defaulting to English.[/red]")
                     lang_for_this_video = "en"
-            display_summary(result, idx)
+            # Number videos by input position; results arrive longest-first in completion order
+            display_summary(result, video_urls.index(task_args[0]))
             interactive_qa_loop(result['summary'], lang_for_this_video, use_gpu)
+        if all(journal.is_complete(url) for url in video_urls):
+            journal.delete()
+        wait_for_indexing()
+        corpus_qa_loop("en" if target_language.lower() == "auto" else target_language, use_gpu)
     except SummarizerError as e:
         console.print(f"[red]Summarization error: {e}[/red]")
     except Exception as e:
@@ -5,6 +5,7 @@ import fitz  # PyMuPDF
 from typing import Dict, Optional
 from src.summarizer import summarize_transcript
 from src.pdf_qa import ask_pdf_question
+from src.corpus_index import index_document
 from rich.console import Console
 from rich.prompt import Prompt
 
@@ -41,6 +42,10 @@ def summarize_pdf(filepath: str, use_gpu: bool = True) -> str:
         raise ValueError("PDF does not contain enough text to summarize.")
     summary = summarize_transcript(text, use_gpu=use_gpu)
     summary_cache[file_hash] = summary
+    try:
+        index_document(f"pdf:{file_hash}", text, source=filepath, title=os.path.basename(filepath), use_gpu=use_gpu)
+    except Exception as e:
+        console.print(f"[yellow]Could not add PDF to corpus index: {e}[/yellow]")
     return summary
 
 def cli():
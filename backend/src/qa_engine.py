@@ -1,16 +1,19 @@
+import threading
 from transformers.pipelines import pipeline
 from transformers import AutoTokenizer, AutoModelForQuestionAnswering
 from sentence_transformers import SentenceTransformer, util
 from src.translator import translate_text, detect_language
+from src.answer_cache import SemanticAnswerCache, hash_text
 import torch
 from src.utils.logging_utils import setup_logger
 from src.utils.error_handling import log_exceptions, SummarizerError
-from typing import Any
+from src.utils.inference_server import MicroBatcher
+from typing import Any, Dict, List, Optional
 
 logger = setup_logger(__name__)
 
 class QAModel:
-    def __init__(self, use_gpu: bool = True) -> None:
+    def __init__(self, use_gpu: bool = True, max_batch_size: int = 16, max_wait_ms: float = 10.0, answer_cache: Optional[SemanticAnswerCache] = None) -> None:
         self.use_gpu = use_gpu and torch.cuda.is_available()
         self.device = 0 if self.use_gpu else -1
         self.model_name = "distilbert-base-uncased-distilled-squad"
@@ -21,40 +24,81 @@ class QAModel:
             device=self.device
         )
         self.embedder = SentenceTransformer('all-MiniLM-L6-v2', device='cuda' if self.use_gpu else 'cpu')
+        self.embed_batcher = MicroBatcher(self.embed_batch, max_batch_size=max_batch_size * 4, max_wait_ms=max_wait_ms, name="embedder")
+        self.qa_batcher = MicroBatcher(self.qa_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, name="qa")
+        self.answer_cache = answer_cache if answer_cache is not None else SemanticAnswerCache()
         logger.info(f"QA engine initialized on {'cuda' if self.use_gpu else 'cpu'}")
 
-    def find_relevant_context(self, summary: str, question: str, top_k: int = 3) -> str:
+    def embed_batch(self, texts: List[str]) -> List[Any]:
+        embeddings = self.embedder.encode(texts, convert_to_tensor=True)
+        return list(embeddings)
+
+    def qa_batch(self, inputs: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        outputs = self.qa_pipeline(inputs, batch_size=len(inputs))
+        # The pipeline unwraps single-element batches
+        return [outputs] if isinstance(outputs, dict) else list(outputs)
+
+    def find_relevant_context(self, summary: str, question: str, top_k: int = 3, question_embedding: Optional[Any] = None) -> str:
         sentences = summary.split('.')
         sentences = [s.strip() for s in sentences if s.strip()]
-        sentence_embeddings = self.embedder.encode(sentences, convert_to_tensor=True)
-        question_embedding = self.embedder.encode([question], convert_to_tensor=True)[0]
+        if question_embedding is None:
+            embeddings = self.embed_batcher.map(sentences + [question])
+            sentence_embeddings = torch.stack(embeddings[:-1])
+            question_embedding = embeddings[-1]
+        else:
+            sentence_embeddings = torch.stack(self.embed_batcher.map(sentences))
         hits = util.semantic_search(question_embedding, sentence_embeddings, top_k=top_k)[0]
         relevant = ' '.join([sentences[hit['corpus_id']] for hit in hits])
         return relevant
 
     def answer(self, summary: str, question: str, target_language: str) -> str:
+        doc_key = f"{hash_text(summary)}:{target_language}"
+        question_embedding = self.embed_batcher.submit(question).result()
+        cached = self.answer_cache.lookup(doc_key, question, question_embedding)
+        if cached is not None:
+            return cached
         question_lang = detect_language(question)
         if question_lang != 'en':
             question_en = translate_text(question, 'en', use_gpu=self.use_gpu)
+            context = self.find_relevant_context(summary, question_en)
         else:
             question_en = question
-        context = self.find_relevant_context(summary, question_en)
-        answer_en = self.qa_pipeline({
+            context = self.find_relevant_context(summary, question_en, question_embedding=question_embedding)
+        answer_en = self.qa_batcher.submit({
             'context': context,
             'question': question_en
-        })['answer']
+        }).result()['answer']
         if target_language != 'en':
             answer = translate_text(answer_en, target_language, use_gpu=self.use_gpu)
         else:
             answer = answer_en
+        # translate_text returns its input when translation fails; don't serve that English answer from the cache
+        if target_language == 'en' or answer != answer_en:
+            self.answer_cache.store(doc_key, question, question_embedding, answer)
         return answer
 
+_shared_lock = threading.Lock()
+_shared_models: Dict[bool, QAModel] = {}
+
+def get_qa_model(use_gpu: bool = True) -> QAModel:
+    """Return the process-wide QAModel, so concurrent callers share one copy of each model and its batch queues."""
+    with _shared_lock:
+        if use_gpu not in _shared_models:
+            _shared_models[use_gpu] = QAModel(use_gpu=use_gpu)
+        return _shared_models[use_gpu]
+
+def answer_cache_stats(use_gpu: bool = True) -> Optional[Dict[str, Any]]:
+    """Hit/miss and similarity stats of the shared model's answer cache, or None if no model is loaded yet."""
+    with _shared_lock:
+        qa = _shared_models.get(use_gpu)
+    return qa.answer_cache.stats() if qa else None
+
 @log_exceptions
 def answer_question(summary: str, question: str, target_language: str, use_gpu: bool = True) -> str:
     """
-    Answer a question about a summary using a QA model.
-    Note: This instantiates a new QAModel for each call. For repeated Q&A, reuse the QAModel instance.
+    Answer a question about a summary using the shared QA model.
+    Requests from concurrent callers are micro-batched through the model's inference queues.
     """
     logger.info(f"Answering question: {question} (target language: {target_language})")
-    qa = QAModel(use_gpu=use_gpu)
+    qa = get_qa_model(use_gpu=use_gpu)
     return qa.answer(summary, question, target_language) 
\ No newline at end of file
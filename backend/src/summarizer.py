@@ -1,15 +1,23 @@
 import re
+import threading
+from collections import Counter
 from transformers.pipelines import pipeline
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 import torch
 from src.utils.logging_utils import setup_logger
 from src.utils.error_handling import log_exceptions, SummarizerError
-from typing import List, Optional
+from src.utils.inference_server import MicroBatcher
+from src.utils.dedup import dedup_chunks
+from typing import Dict, List, Optional
 
 logger = setup_logger(__name__)
 
+MAX_INPUT_LENGTH = 1024
+# Estimated Jaccard similarity above which a chunk is treated as a near-duplicate of an earlier one
+DEDUP_THRESHOLD = 0.8
+
 class TranscriptSummarizer:
-    def __init__(self, use_gpu: bool = True, max_chunk_size: int = 1000, overlap: int = 100) -> None:
+    def __init__(self, use_gpu: bool = True, max_chunk_size: int = 1000, overlap: int = 100, max_batch_size: int = 8, max_wait_ms: float = 10.0) -> None:
         self.use_gpu = use_gpu and torch.cuda.is_available()
         self.device = "cuda" if self.use_gpu else "cpu"
         self.max_chunk_size = max_chunk_size
@@ -19,10 +27,11 @@ class TranscriptSummarizer:
         self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name).to(self.device)
         self.summarizer = pipeline(
             "summarization",
-            model=model_name,
-            tokenizer=model_name,
+            model=self.model,
+            tokenizer=self.tokenizer,
             device=0 if self.use_gpu else -1
         )
+        self.batcher = MicroBatcher(self.summarize_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, name="summarizer")
         logger.info(f"Summarizer initialized on {self.device}")
 
     def chunk_text(self, text: str) -> List[str]:
@@ -47,17 +56,30 @@ class TranscriptSummarizer:
         logger.info(f"Split transcript into {len(chunks)} chunks")
         return chunks
 
+    def summarize_batch(self, chunks: List[str]) -> List[str]:
+        """Run one generation pass over a batch of chunks. Used by the shared micro-batcher."""
+        inputs = [chunk[:MAX_INPUT_LENGTH] for chunk in chunks]
+        outputs = self.summarizer(inputs, max_length=150, min_length=50, do_sample=False, batch_size=len(inputs))
+        return [output['summary_text'].strip() for output in outputs]
+
+    def fallback_summary(self, chunk: str) -> str:
+        sentences = chunk[:MAX_INPUT_LENGTH].split('.')
+        return '. '.join(sentences[:3]) + '.'
+
     def summarize_chunk(self, chunk: str) -> str:
-        try:
-            max_input_length = 1024
-            if len(chunk) > max_input_length:
-                chunk = chunk[:max_input_length]
-            summary = self.summarizer(chunk, max_length=150, min_length=50, do_sample=False)[0]['summary_text']
-            return summary.strip()
-        except Exception as e:
-            logger.warning(f"Failed to summarize chunk: {e}")
-            sentences = chunk.split('.')
-            return '. '.join(sentences[:3]) + '.'
+        return self.summarize_chunks([chunk])[0]
+
+    def summarize_chunks(self, chunks: List[str]) -> List[str]:
+        """Queue all chunks at once so they share micro-batches with other concurrent callers."""
+        futures = [self.batcher.submit(chunk) for chunk in chunks]
+        summaries = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                summaries.append(future.result())
+            except Exception as e:
+                logger.warning(f"Failed to summarize chunk: {e}")
+                summaries.append(self.fallback_summary(chunk))
+        return summaries
 
     def merge_summaries(self, summaries: List[str]) -> str:
         if not summaries:
@@ -69,18 +91,57 @@ class TranscriptSummarizer:
             return self.summarize_chunk(combined)
         return combined
 
+def extractive_summary(text: str, max_sentences: int = 5) -> str:
+    """Pick the sentences with the highest average word frequency, in their original order. No model call."""
+    sentences = []
+    for sentence in re.split(r'(?<=[.!?])\s+', re.sub(r'\s+', ' ', text).strip()):
+        # Auto-captions are often unpunctuated, so fall back to fixed-size word windows
+        words = sentence.split()
+        sentences.extend(' '.join(words[i:i + 40]) for i in range(0, len(words), 40))
+    if len(sentences) <= max_sentences:
+        return ' '.join(sentences)
+    frequencies = Counter(word for word in re.findall(r'\w+', text.lower()) if len(word) > 3)
+    def score(sentence: str) -> float:
+        words = [word for word in re.findall(r'\w+', sentence.lower()) if len(word) > 3]
+        return sum(frequencies[word] for word in words) / len(words) if words else 0.0
+    top = sorted(range(len(sentences)), key=lambda i: score(sentences[i]), reverse=True)[:max_sentences]
+    return ' '.join(sentences[i] for i in sorted(top))
+
+_shared_lock = threading.Lock()
+_shared_summarizers: Dict[bool, TranscriptSummarizer] = {}
+
+def get_summarizer(use_gpu: bool = True) -> TranscriptSummarizer:
+    """Return the process-wide summarizer, so concurrent workers share one model and one batch queue."""
+    with _shared_lock:
+        if use_gpu not in _shared_summarizers:
+            _shared_summarizers[use_gpu] = TranscriptSummarizer(use_gpu=use_gpu)
+        return _shared_summarizers[use_gpu]
+
 @log_exceptions
-def summarize_transcript(transcript: str, use_gpu: bool = True) -> str:
-    logger.info("Starting transcript summarization")
+def summarize_transcript_chunks(transcript: str, use_gpu: bool = True, dedup: bool = True) -> List[str]:
+    """Chunk the transcript and summarize each chunk, without the final merge."""
     if not transcript or len(transcript.strip()) < 50:
         raise SummarizerError("Transcript is too short to summarize")
-    summarizer = TranscriptSummarizer(use_gpu=use_gpu)
+    summarizer = get_summarizer(use_gpu=use_gpu)
     chunks = summarizer.chunk_text(transcript)
-    chunk_summaries = []
-    for i, chunk in enumerate(chunks):
-        logger.info(f"Summarizing chunk {i+1}/{len(chunks)}")
-        summary = summarizer.summarize_chunk(chunk)
-        chunk_summaries.append(summary)
-    final_summary = summarizer.merge_summaries(chunk_summaries)
+    if dedup:
+        chunks, stats = dedup_chunks(chunks, threshold=DEDUP_THRESHOLD)
+        if stats['calls_saved']:
+            logger.info(f"Near-duplicate removal saved {stats['calls_saved']} of {stats['input_chunks']} model calls")
+    logger.info(f"Summarizing {len(chunks)} chunks")
+    return summarizer.summarize_chunks(chunks)
+
+@log_exceptions
+def merge_chunk_summaries(chunk_summaries: List[str], use_gpu: bool = True) -> str:
+    # A single summary needs no merge pass, so skip loading the model for it
+    if len(chunk_summaries) == 1:
+        return chunk_summaries[0]
+    return get_summarizer(use_gpu=use_gpu).merge_summaries(chunk_summaries)
+
+@log_exceptions
+def summarize_transcript(transcript: str, use_gpu: bool = True, dedup: bool = True) -> str:
+    logger.info("Starting transcript summarization")
+    chunk_summaries = summarize_transcript_chunks(transcript, use_gpu=use_gpu, dedup=dedup)
+    final_summary = merge_chunk_summaries(chunk_summaries, use_gpu=use_gpu)
     logger.info(f"Summarization completed. Final summary length: {len(final_summary)}")
     return final_summary 
\ No newline at end of file
@@ -1,12 +1,10 @@
-import os
-import tempfile
 from youtube_transcript_api._api import YouTubeTranscriptApi
 from faster_whisper import WhisperModel
 from pytube import YouTube
 from src.utils.logging_utils import setup_logger
 from src.utils.error_handling import log_exceptions, SummarizerError
-from src.utils.media import extract_video_id, download_audio
-from typing import Optional
+from src.utils.media import extract_video_id, speech_audio
+from typing import Callable, Optional, Tuple
 
 logger = setup_logger(__name__)
 
@@ -23,13 +21,23 @@ def get_youtube_transcript(url: str) -> Optional[str]:
         logger.warning(f"Could not get YouTube transcript: {e}")
         return None
 
+def has_youtube_transcript(url: str) -> bool:
+    """Check whether YouTube lists any caption track for the video, without fetching it."""
+    try:
+        video_id = extract_video_id(url)
+        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        return any(True for _ in transcript_list)
+    except Exception as e:
+        logger.warning(f"Could not list YouTube transcripts: {e}")
+        return False
+
 @log_exceptions
-def transcribe_audio(audio_path: str, use_gpu: bool = True) -> str:
+def transcribe_audio(audio_path: str, use_gpu: bool = True, model_size: str = "base") -> str:
     """Transcribe audio using faster-whisper with GPU acceleration if available."""
     try:
         device = "cuda" if use_gpu else "cpu"
         compute_type = "float16" if use_gpu else "int8"
-        model = WhisperModel("base", device=device, compute_type=compute_type)
+        model = WhisperModel(model_size, device=device, compute_type=compute_type)
         segments, info = model.transcribe(audio_path, beam_size=5)
         transcript = " ".join(segment.text for segment in segments)
         logger.info(f"Transcription completed. Language: {info.language}")
@@ -38,17 +46,20 @@ def transcribe_audio(audio_path: str, use_gpu: bool = True) -> str:
         raise SummarizerError(f"Failed to transcribe audio: {e}")
 
 @log_exceptions
-def get_transcript_or_transcribe(url: str, use_gpu: bool = True) -> str:
-    """Main function: try to get YouTube transcript, fallback to audio transcription."""
+def get_transcript_with_tier(url: str, use_gpu: bool = True, choose_whisper_model: Callable[[], str] = lambda: "base") -> Tuple[str, str]:
+    """Get the caption transcript, or fall back to Whisper with the model size picked by choose_whisper_model.
+    Returns the transcript and the tier used ("caption" or "whisper-<size>")."""
     logger.info(f"Processing transcript for: {url}")
     transcript = get_youtube_transcript(url)
     if transcript and len(transcript) > 100:
         logger.info("Using YouTube auto-generated transcript")
-        return transcript
-    logger.info("YouTube transcript not available, downloading audio for transcription")
-    with tempfile.TemporaryDirectory() as temp_dir:
-        audio_path = download_audio(url, temp_dir)
-        transcript = transcribe_audio(audio_path, use_gpu=use_gpu)
-        if os.path.exists(audio_path):
-            os.remove(audio_path)
-    return transcript 
\ No newline at end of file
+        return transcript, "caption"
+    logger.info("YouTube transcript not available, fetching audio for transcription")
+    model_size = choose_whisper_model()
+    with speech_audio(url) as audio_path:
+        return transcribe_audio(audio_path, use_gpu=use_gpu, model_size=model_size), f"whisper-{model_size}"
+
+@log_exceptions
+def get_transcript_or_transcribe(url: str, use_gpu: bool = True) -> str:
+    """Main function: try to get YouTube transcript, fallback to audio transcription."""
+    return get_transcript_with_tier(url, use_gpu=use_gpu)[0]
@@ -1,15 +1,16 @@
 import concurrent.futures
-from typing import Callable, List, Any, Tuple
+from typing import Callable, Iterator, List, Any, Tuple
 
-def run_concurrent_tasks(task_fn: Callable, task_args_list: List[Any], max_workers: int = 4) -> List[Tuple[Any, Any]]:
-    results: List[Tuple[Any, Any]] = []
+def iter_concurrent_tasks(task_fn: Callable, task_args_list: List[Any], max_workers: int = 4) -> Iterator[Tuple[Any, Any]]:
+    """Yield (args, result) pairs as soon as each task finishes. Tasks are submitted in list order."""
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         future_to_args = {executor.submit(task_fn, *args): args for args in task_args_list}
         for future in concurrent.futures.as_completed(future_to_args):
             args = future_to_args[future]
             try:
-                result = future.result()
-                results.append((args, result))
+                yield args, future.result()
             except Exception as exc:
-                results.append((args, exc))
-    return results 
\ No newline at end of file
+                yield args, exc
+
+def run_concurrent_tasks(task_fn: Callable, task_args_list: List[Any], max_workers: int = 4) -> List[Tuple[Any, Any]]:
+    return list(iter_concurrent_tasks(task_fn, task_args_list, max_workers=max_workers))
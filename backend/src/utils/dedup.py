@@ -0,0 +1,83 @@
+import re
+import zlib
+import numpy as np
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+from src.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SIGNATURE_BLOCK = 256  # chunks hashed per vectorized block, bounds peak memory
+
+def _shingle_hashes(text: str, shingle_size: int) -> np.ndarray:
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < shingle_size:
+        shingles = set(words)
+    else:
+        shingles = {' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+def minhash_signatures(texts: List[str], num_perm: int = 64, shingle_size: int = 5, seed: int = 1) -> np.ndarray:
+    """Return a (len(texts), num_perm) MinHash signature matrix over word shingles."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+    signatures = np.full((len(texts), num_perm), _MAX_HASH, dtype=np.uint64)
+    for start in range(0, len(texts), _SIGNATURE_BLOCK):
+        hashes = [_shingle_hashes(text, shingle_size) for text in texts[start:start + _SIGNATURE_BLOCK]]
+        lengths = np.array([len(h) for h in hashes])
+        if not lengths.sum():
+            continue
+        permuted = (a * np.concatenate(hashes)[None, :] % _MERSENNE_PRIME + b) % _MERSENNE_PRIME & _MAX_HASH
+        non_empty = np.nonzero(lengths)[0]
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])[non_empty]
+        signatures[start + non_empty] = np.minimum.reduceat(permuted, offsets, axis=1).T
+    return signatures
+
+def dedup_chunks(chunks: List[str], threshold: float = 0.8, num_perm: int = 64, bands: int = 16, merge: bool = False) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Drop chunks whose estimated Jaccard similarity to an earlier kept chunk is at least threshold.
+    Candidates come from LSH banding of MinHash signatures. With merge=True, sentences of a duplicate
+    that its representative lacks are appended to the representative instead of being dropped.
+    Returns the kept chunks and stats including the number of model calls saved.
+    """
+    if len(chunks) <= 1:
+        return list(chunks), {'input_chunks': len(chunks), 'kept_chunks': len(chunks), 'calls_saved': 0, 'duplicates': {}}
+    signatures = minhash_signatures(chunks, num_perm=num_perm)
+    rows = num_perm // bands
+    buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+    kept: List[int] = []
+    duplicates: Dict[int, int] = {}
+    merged = {i: chunk for i, chunk in enumerate(chunks)}
+    for i in range(len(chunks)):
+        keys = [(band, signatures[i, band * rows:(band + 1) * rows].tobytes()) for band in range(bands)]
+        candidates = {j for key in keys for j in buckets.get(key, ())}
+        representative = None
+        if candidates:
+            candidate_ids = np.fromiter(candidates, dtype=np.int64)
+            similarity = (signatures[candidate_ids] == signatures[i]).mean(axis=1)
+            best = int(np.argmax(similarity))
+            if similarity[best] >= threshold:
+                representative = int(candidate_ids[best])
+        if representative is None:
+            kept.append(i)
+            for key in keys:
+                buckets[key].append(i)
+            continue
+        duplicates[i] = representative
+        if merge:
+            existing = merged[representative]
+            extra = [s for s in re.split(r'(?<=[.!?])\s+', chunks[i]) if s and s not in existing]
+            if extra:
+                merged[representative] = f"{existing} {' '.join(extra)}"
+    stats = {
+        'input_chunks': len(chunks),
+        'kept_chunks': len(kept),
+        'calls_saved': len(duplicates),
+        'duplicates': duplicates
+    }
+    if duplicates:
+        logger.info(f"Skipped {len(duplicates)}/{len(chunks)} near-duplicate chunks")
+    return [merged[i] for i in kept], stats
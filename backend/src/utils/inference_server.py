@@ -0,0 +1,76 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Tuple
+from src.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__)
+
+class MicroBatcher:
+    """
+    Shared in-process inference queue.
+    Requests from concurrent callers are collected into micro-batches (bounded by max_batch_size
+    and max_wait_ms) and run through batch_fn in a single worker thread, one forward pass per batch.
+    batch_fn takes a list of inputs and must return a list of outputs of the same length.
+    """
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 8, max_wait_ms: float = 10.0, name: str = "inference") -> None:
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name=f"{name}-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def map(self, items: List[Any]) -> List[Any]:
+        """Submit all items at once and wait for their results, preserving order."""
+        futures = [self.submit(item) for item in items]
+        return [future.result() for future in futures]
+
+    def _collect(self) -> List[Tuple[Any, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                outputs = self._call([item for item, _ in batch])
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                # Isolate the failing input so unrelated callers sharing the batch still get results
+                logger.warning(f"{self.name} batch of {len(batch)} failed, retrying items individually: {e}")
+                for item, future in batch:
+                    try:
+                        future.set_result(self._call([item])[0])
+                    except Exception as item_error:
+                        future.set_exception(item_error)
+                continue
+            for (_, future), output in zip(batch, outputs):
+                future.set_result(output)
+
+    def _call(self, items: List[Any]) -> List[Any]:
+        outputs = self.batch_fn(items)
+        if len(outputs) != len(items):
+            raise RuntimeError(f"{self.name} batch returned {len(outputs)} results for {len(items)} inputs")
+        return outputs
@@ -1,7 +1,24 @@
 import os
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+import wave
+from contextlib import contextmanager
+import av
 from pytube import YouTube
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional
 from src.utils.error_handling import SummarizerError, log_exceptions
+from src.utils.logging_utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Whisper resamples everything to 16 kHz mono, so anything above speech quality is wasted bandwidth.
+MIN_SPEECH_ABR_KBPS = 48
+WHISPER_SAMPLE_RATE = 16000
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+AUDIO_CACHE_DIR = os.environ.get("AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "smart_summary_audio"))
+AUDIO_CACHE_MAX_BYTES = int(os.environ.get("AUDIO_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
 
 def extract_video_id(url: str) -> str:
     """Extract YouTube video ID from URL."""
@@ -15,16 +32,223 @@ def extract_video_id(url: str) -> str:
     except Exception as e:
         raise SummarizerError(f"Could not extract video ID from URL: {e}")
 
+def _abr_kbps(stream: Any) -> int:
+    try:
+        return int(str(stream.abr).lower().replace('kbps', ''))
+    except (TypeError, ValueError):
+        return 0
+
+def select_speech_stream(yt: YouTube) -> Optional[Any]:
+    """Pick the smallest audio stream that is still good enough for speech recognition."""
+    streams = sorted(yt.streams.filter(only_audio=True), key=_abr_kbps)
+    for stream in streams:
+        if _abr_kbps(stream) >= MIN_SPEECH_ABR_KBPS:
+            return stream
+    return streams[-1] if streams else None
+
+# Client errors other than these will not succeed on retry
+RETRYABLE_CLIENT_ERRORS = {408, 429}
+
+def _expected_size(response: Any, offset: int) -> Optional[int]:
+    """Total file size implied by the response headers, or None if the server did not say."""
+    content_range = response.headers.get('Content-Range')
+    if response.status == 206 and content_range and '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        if total.isdigit():
+            return int(total)
+    length = response.headers.get('Content-Length')
+    if length and length.isdigit():
+        return offset + int(length)
+    return None
+
+def _resumes_same_file(response: Any, offset: int, expected_size: Optional[int]) -> bool:
+    """Whether a 206 response continues the partial file at offset, judged by its Content-Range."""
+    content_range = response.headers.get('Content-Range', '')
+    if not content_range.startswith(f'bytes {offset}-') or '/' not in content_range:
+        return False
+    total = content_range.rsplit('/', 1)[1]
+    return expected_size is None or (total.isdigit() and int(total) == expected_size)
+
+def _open_range(url: str, offset: int, timeout: float) -> Any:
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+    return urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout)
+
+def download_resumable(url: str, dest_path: str, expected_size: Optional[int] = None, retries: int = 3, timeout: float = 30.0) -> str:
+    """
+    Download url to dest_path over HTTP, resuming from dest_path + '.part' with a Range request
+    if an earlier attempt was interrupted. Works against any HTTP server, including a local stand-in.
+    With expected_size set, a partial file is only resumed if the server reports the same total size,
+    so bytes of a different file that happens to share the name are never appended to.
+    """
+    part_path = dest_path + '.part'
+    for attempt in range(1, retries + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        try:
+            response = _open_range(url, offset, timeout)
+            if offset and response.status == 206 and not _resumes_same_file(response, offset, expected_size):
+                logger.warning(f"Partial download does not match {response.headers.get('Content-Range')}, restarting it")
+                response.close()
+                os.remove(part_path)
+                offset = 0
+                response = _open_range(url, offset, timeout)
+            with response:
+                if offset and response.status != 206:
+                    logger.info("Server ignored range request, restarting download")
+                    offset = 0
+                expected = _expected_size(response, offset)
+                with open(part_path, 'ab' if offset else 'wb') as f:
+                    while chunk := response.read(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            # A connection closed early is not an error for read(), so check the size ourselves
+            received = os.path.getsize(part_path)
+            if expected is not None and received < expected:
+                raise urllib.error.ContentTooShortError(f"Got {received} of {expected} bytes", None)
+            os.replace(part_path, dest_path)
+            return dest_path
+        except urllib.error.HTTPError as e:
+            # 416 on a resumed request means the partial file already holds the whole body
+            if e.code == 416 and offset and (expected_size is None or offset == expected_size):
+                os.replace(part_path, dest_path)
+                return dest_path
+            if e.code == 416 and offset and attempt < retries:
+                logger.warning(f"Partial download has {offset} bytes, expected {expected_size}; restarting it")
+                os.remove(part_path)
+                continue
+            if attempt == retries or (e.code < 500 and e.code not in RETRYABLE_CLIENT_ERRORS):
+                raise
+            logger.warning(f"Download failed with HTTP {e.code} at attempt {attempt}/{retries}, retrying")
+        except (urllib.error.URLError, OSError) as e:
+            if attempt == retries:
+                raise
+            logger.warning(f"Download interrupted at attempt {attempt}/{retries}, resuming: {e}")
+    return dest_path
+
+def decode_to_pcm16k(source_path: str, dest_path: str) -> str:
+    """Decode any audio file to a 16 kHz mono 16-bit WAV, frame by frame, without loading it into memory."""
+    tmp_path = dest_path + '.tmp'
+    resampler = av.AudioResampler(format='s16', layout='mono', rate=WHISPER_SAMPLE_RATE)
+    with av.open(source_path) as container, wave.open(tmp_path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(WHISPER_SAMPLE_RATE)
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                wav.writeframes(resampled.to_ndarray().tobytes())
+        for resampled in resampler.resample(None):
+            wav.writeframes(resampled.to_ndarray().tobytes())
+    os.replace(tmp_path, dest_path)
+    return dest_path
+
+class AudioCache:
+    """
+    Size-bounded on-disk cache of decoded 16 kHz audio keyed by video ID, evicting least recently used.
+    Paths handed out by acquire are leased and never evicted until released.
+    """
+    def __init__(self, cache_dir: str = AUDIO_CACHE_DIR, max_bytes: int = AUDIO_CACHE_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.partial_dir = os.path.join(cache_dir, 'partial')
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._video_locks: Dict[str, threading.Lock] = {}
+        self._leases: Dict[str, int] = {}
+        os.makedirs(self.partial_dir, exist_ok=True)
+
+    def path_for(self, video_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{video_id}.wav")
+
+    def lock_for(self, video_id: str) -> threading.Lock:
+        with self._lock:
+            return self._video_locks.setdefault(video_id, threading.Lock())
+
+    def acquire(self, video_id: str) -> Optional[str]:
+        """Lease the cached WAV for video_id, or return None on a miss."""
+        with self._lock:
+            path = self.path_for(video_id)
+            if not os.path.exists(path):
+                return None
+            os.utime(path)
+            self._leases[path] = self._leases.get(path, 0) + 1
+            return path
+
+    def release(self, path: str) -> None:
+        with self._lock:
+            count = self._leases.get(path, 0) - 1
+            if count > 0:
+                self._leases[path] = count
+            else:
+                self._leases.pop(path, None)
+
+    def put(self, video_id: str, wav_path: str) -> str:
+        """Move wav_path into the cache and return it leased, like acquire."""
+        path = self.path_for(video_id)
+        with self._lock:
+            if wav_path != path:
+                os.replace(wav_path, path)
+            self._leases[path] = self._leases.get(path, 0) + 1
+        self.evict()
+        return path
+
+    def evict(self) -> None:
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if name.endswith('.wav') and os.path.isfile(path):
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path in self._leases:
+                    continue
+                os.remove(path)
+                total -= size
+                logger.info(f"Evicted {os.path.basename(path)} from audio cache")
+
+_default_cache: Optional[AudioCache] = None
+
+def get_audio_cache() -> AudioCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AudioCache()
+    return _default_cache
+
 @log_exceptions
 def download_audio(url: str, output_path: str) -> str:
-    """Download audio from YouTube video using pytube."""
+    """Download the smallest speech-quality audio stream from a YouTube video, resuming partial downloads."""
     try:
         yt = YouTube(url)
-        audio_stream = yt.streams.filter(only_audio=True).order_by('abr').desc().first()
+        audio_stream = select_speech_stream(yt)
         if not audio_stream:
             raise SummarizerError("No audio stream found for this video")
-        filename = f"audio_{yt.video_id}.mp4"
-        file_path = audio_stream.download(output_path=output_path, filename=filename)
-        return file_path
+        # The itag identifies the exact stream, so a partial file is never resumed from a different one
+        filename = f"audio_{yt.video_id}_{audio_stream.itag}.{audio_stream.subtype or 'mp4'}"
+        logger.info(f"Downloading {audio_stream.abr} audio stream for {yt.video_id}")
+        return download_resumable(audio_stream.url, os.path.join(output_path, filename), expected_size=audio_stream.filesize)
     except Exception as e:
-        raise SummarizerError(f"Failed to download audio from {url}: {e}") 
\ No newline at end of file
+        raise SummarizerError(f"Failed to download audio from {url}: {e}")
+
+@contextmanager
+def speech_audio(url: str, cache: Optional[AudioCache] = None) -> Iterator[str]:
+    """Yield a cached 16 kHz mono WAV for the video, downloading and decoding it on a cache miss.
+    The file is leased from the cache, so it cannot be evicted while the caller is using it."""
+    cache = cache or get_audio_cache()
+    video_id = extract_video_id(url)
+    with cache.lock_for(video_id):
+        path = cache.acquire(video_id)
+        if path:
+            logger.info(f"Audio cache hit for {video_id}")
+        else:
+            # Partial downloads live in the cache directory so they survive restarts and can be resumed
+            source_path = download_audio(url, cache.partial_dir)
+            try:
+                wav_path = decode_to_pcm16k(source_path, os.path.join(cache.partial_dir, f"{video_id}.wav"))
+            finally:
+                if os.path.exists(source_path):
+                    os.remove(source_path)
+            path = cache.put(video_id, wav_path)
+    try:
+        yield path
+    finally:
+        cache.release(path)
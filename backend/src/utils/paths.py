@@ -0,0 +1,8 @@
+import os
+
+# Durable per-user storage for state that has to survive reboots (corpus index, job journals).
+# Unlike the temp directory, it is not cleared at boot or backed by tmpfs.
+DATA_DIR = os.environ.get(
+    "SMART_SUMMARY_DATA_DIR",
+    os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share"), "smart_summary")
+)
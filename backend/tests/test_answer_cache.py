@@ -0,0 +1,71 @@
+import math
+import pytest
+import torch
+from src.answer_cache import SemanticAnswerCache, hash_text
+
+DOC = f"{hash_text('a summary of the video')}:en"
+
+def _unit(angle_degrees):
+    """A 2-d unit vector; cosine similarity between two of them is cos(angle difference)."""
+    radians = math.radians(angle_degrees)
+    return torch.tensor([math.cos(radians), math.sin(radians)])
+
+def test_exact_question_hits_regardless_of_embedding():
+    cache = SemanticAnswerCache(threshold=0.99)
+    cache.store(DOC, "What is it about?", _unit(0), "Cats.")
+    assert cache.lookup(DOC, "  what is it ABOUT?  ", _unit(90)) == "Cats."
+
+def test_similar_question_hits_at_threshold():
+    cache = SemanticAnswerCache(threshold=0.9)
+    cache.store(DOC, "What is it about?", _unit(0), "Cats.")
+    # cos(20 degrees) ~ 0.94 is above the threshold, cos(30 degrees) ~ 0.87 is below it
+    assert cache.lookup(DOC, "What's the topic?", _unit(20)) == "Cats."
+    assert cache.lookup(DOC, "Who made it?", _unit(30)) is None
+
+def test_closest_stored_question_wins():
+    cache = SemanticAnswerCache(threshold=0.9)
+    cache.store(DOC, "first", _unit(0), "A")
+    cache.store(DOC, "second", _unit(20), "B")
+    assert cache.lookup(DOC, "near second", _unit(18)) == "B"
+
+def test_no_hits_across_documents_or_languages():
+    cache = SemanticAnswerCache(threshold=0.9)
+    cache.store(DOC, "What is it about?", _unit(0), "Cats.")
+    other_doc = f"{hash_text('another video')}:en"
+    same_doc_french = f"{hash_text('a summary of the video')}:fr"
+    assert cache.lookup(other_doc, "What is it about?", _unit(0)) is None
+    assert cache.lookup(same_doc_french, "What is it about?", _unit(0)) is None
+
+def test_lru_eviction_cleans_up_doc_index():
+    cache = SemanticAnswerCache(threshold=0.9, max_entries=2)
+    cache.store("doc-a", "q1", _unit(0), "a1")
+    cache.store("doc-b", "q2", _unit(0), "b1")
+    # Touch doc-a so doc-b is the least recently used entry
+    assert cache.lookup("doc-a", "q1", _unit(0)) == "a1"
+    cache.store("doc-c", "q3", _unit(0), "c1")
+    assert cache.lookup("doc-b", "q2", _unit(0)) is None
+    assert "doc-b" not in cache._doc_index
+    assert set(cache._doc_index) == {"doc-a", "doc-c"}
+    assert cache.stats()['entries'] == 2
+
+def test_eviction_keeps_doc_index_while_the_doc_has_entries():
+    cache = SemanticAnswerCache(threshold=0.9, max_entries=2)
+    cache.store("doc-a", "q1", _unit(0), "a1")
+    cache.store("doc-a", "q2", _unit(90), "a2")
+    cache.store("doc-b", "q3", _unit(0), "b1")
+    assert list(cache._doc_index["doc-a"]) == [("doc-a", "q2")]
+    assert cache.lookup("doc-a", "other", _unit(90)) == "a2"
+
+def test_stats():
+    cache = SemanticAnswerCache(threshold=0.9)
+    assert cache.stats()['hit_rate'] == 0.0
+    cache.store(DOC, "What is it about?", _unit(0), "Cats.")
+    cache.lookup(DOC, "What is it about?", _unit(0))
+    cache.lookup(DOC, "What's the topic?", _unit(20))
+    cache.lookup(DOC, "Who made it?", _unit(90))
+    stats = cache.stats()
+    assert stats['entries'] == 1
+    assert stats['hits'] == 2 and stats['misses'] == 1
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+    assert stats['mean_hit_similarity'] == pytest.approx((1.0 + math.cos(math.radians(20))) / 2, abs=1e-5)
+    assert stats['threshold'] == 0.9
@@ -0,0 +1,28 @@
+import pytest
+import src.batch_processor as batch_processor
+from src.batch_processor import schedule_longest_first
+
+COSTS = {'a': 10.0, 'b': 300.0, 'c': 45.0, 'd': 120.0, 'e': 5.0}
+
+@pytest.fixture
+def estimated(monkeypatch):
+    calls = []
+    def fake_estimate(url):
+        calls.append(url)
+        if url not in COSTS:
+            raise RuntimeError("video info unavailable")
+        return COSTS[url]
+    monkeypatch.setattr(batch_processor, 'estimate_video_cost', fake_estimate)
+    return calls
+
+def test_orders_by_descending_cost(estimated):
+    assert schedule_longest_first(list(COSTS), max_workers=2) == ['b', 'd', 'c', 'a', 'e']
+    assert sorted(estimated) == sorted(COSTS)
+
+def test_skips_estimation_when_every_video_gets_a_worker(estimated):
+    assert schedule_longest_first(['a', 'b', 'c'], max_workers=4) == ['a', 'b', 'c']
+    assert schedule_longest_first(['a', 'b'], max_workers=2) == ['a', 'b']
+    assert estimated == []
+
+def test_failed_estimates_go_last(estimated):
+    assert schedule_longest_first(['unknown', 'a', 'b', 'c'], max_workers=2) == ['b', 'c', 'a', 'unknown']
@@ -0,0 +1,32 @@
+import threading
+import time
+from src.utils.concurrency import iter_concurrent_tasks, run_concurrent_tasks
+
+def test_results_stream_before_the_slowest_task_finishes():
+    release_slow = threading.Event()
+    def task(name):
+        if name == 'slow':
+            assert release_slow.wait(timeout=5)
+        return name.upper()
+    results = iter_concurrent_tasks(task, [('slow',), ('fast',)], max_workers=2)
+    assert next(results) == (('fast',), 'FAST')
+    release_slow.set()
+    assert next(results) == (('slow',), 'SLOW')
+
+def test_tasks_are_submitted_in_list_order():
+    started = []
+    def task(i):
+        started.append(i)
+        time.sleep(0.01)
+        return i
+    run_concurrent_tasks(task, [(i,) for i in range(6)], max_workers=1)
+    assert started == list(range(6))
+
+def test_exceptions_are_returned_as_results():
+    def task(i):
+        if i == 1:
+            raise ValueError("boom")
+        return i
+    results = dict(run_concurrent_tasks(task, [(0,), (1,), (2,)], max_workers=2))
+    assert results[(0,)] == 0 and results[(2,)] == 2
+    assert isinstance(results[(1,)], ValueError)
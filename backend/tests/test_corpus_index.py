@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+import threading
+import numpy as np
+import pytest
+from src.corpus_index import CorpusIndex, split_passages
+
+DIM = 16
+
+def _passages(doc_id, count, start=0):
+    return [{'doc_id': doc_id, 'text': f"{doc_id}-{i}"} for i in range(start, start + count)]
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).normal(size=(2500, DIM)).astype(np.float32)
+
+def test_add_search_and_reload(tmp_path, vectors):
+    index = CorpusIndex(str(tmp_path), dim=DIM, shard_size=1000)
+    index.add(vectors[:1500], _passages('a', 1500))
+    index.add(vectors[1500:], _passages('b', 1000, start=1500))
+    reopened = CorpusIndex(str(tmp_path), dim=DIM, shard_size=1000)
+    assert len(reopened) == 2500
+    assert reopened.doc_ids == {'a', 'b'}
+    hits = reopened.search(vectors[1234], top_k=3)
+    assert hits[0]['text'] == 'a-1234'
+    assert hits[0]['score'] == pytest.approx(1.0, abs=1e-5)
+    assert [h['score'] for h in hits] == sorted((h['score'] for h in hits), reverse=True)
+
+def test_already_indexed_documents_are_skipped(tmp_path, vectors):
+    index = CorpusIndex(str(tmp_path), dim=DIM)
+    index.add(vectors[:10], _passages('a', 10))
+    index.add(vectors[10:20], _passages('a', 10))
+    assert len(index) == 10
+
+def test_reload_ignores_partial_writes(tmp_path, vectors):
+    index = CorpusIndex(str(tmp_path), dim=DIM, shard_size=1000)
+    index.add(vectors[:100], _passages('a', 100))
+    # Simulate a crash after the vectors and half a metadata line were written
+    with open(os.path.join(str(tmp_path), 'shard_00000.f32'), 'ab') as f:
+        f.write(vectors[100:105].tobytes())
+    with open(index.metadata_path, 'ab') as f:
+        f.write(b'{"doc_id": "crashed", "te')
+    reopened = CorpusIndex(str(tmp_path), dim=DIM, shard_size=1000)
+    assert len(reopened) == 100
+    assert 'crashed' not in reopened.doc_ids
+    reopened.add(vectors[200:210], _passages('b', 10))
+    final = CorpusIndex(str(tmp_path), dim=DIM, shard_size=1000)
+    assert len(final) == 110
+    assert final.search(vectors[205], top_k=1)[0]['text'] == 'b-5'
+    assert final.search(vectors[50], top_k=1)[0]['text'] == 'a-50'
+
+def test_ivf_search_matches_brute_force(tmp_path, vectors):
+    index = CorpusIndex(str(tmp_path), dim=DIM, shard_size=1000)
+    index.add(vectors, _passages('a', len(vectors)))
+    brute = [h['text'] for h in index.search(vectors[42], top_k=3)]
+    index.build_ivf(n_lists=20)
+    assert [h['text'] for h in index.search(vectors[42], top_k=3, nprobe=20)] == brute
+    assert index.search(vectors[42], top_k=1, nprobe=2)[0]['text'] == 'a-42'
+    # Rows appended after clustering are assigned to a list and found through IVF too
+    extra = np.random.default_rng(1).normal(size=(5, DIM)).astype(np.float32)
+    index.add(extra, _passages('b', 5))
+    reopened = CorpusIndex(str(tmp_path), dim=DIM, shard_size=1000)
+    assert reopened.centroids is not None
+    assert reopened.search(extra[3], top_k=1, nprobe=2)[0]['text'] == 'b-3'
+
+def test_sees_appends_from_another_process(tmp_path, vectors):
+    index = CorpusIndex(str(tmp_path), dim=DIM)
+    index.add(vectors[:10], _passages('a', 10))
+    script = (
+        "import numpy as np; from src.corpus_index import CorpusIndex; "
+        f"CorpusIndex({str(tmp_path)!r}, dim={DIM}).add(np.ones((3, {DIM})), "
+        "[{'doc_id': 'other', 'text': str(i)} for i in range(3)])"
+    )
+    subprocess.run([sys.executable, '-c', script], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+    index.add(vectors[10:20], _passages('b', 10))
+    reopened = CorpusIndex(str(tmp_path), dim=DIM)
+    assert len(reopened) == 23
+    assert reopened.doc_ids == {'a', 'other', 'b'}
+    assert reopened.search(vectors[15], top_k=1)[0]['text'] == 'b-5'
+
+def test_concurrent_contains_keeps_offsets_consistent(tmp_path, vectors):
+    writer = CorpusIndex(str(tmp_path), dim=DIM)
+    reader = CorpusIndex(str(tmp_path), dim=DIM)
+    writer.add(vectors[:500], _passages('a', 500))
+    threads = [threading.Thread(target=reader.contains, args=('a',)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(reader._offsets) == 500
+    assert reader.contains('a') and not reader.contains('b')
+    assert reader.search(vectors[321], top_k=1)[0]['text'] == 'a-321'
+
+def test_split_passages_respects_max_chars():
+    passages = split_passages("First sentence here. " * 100, max_chars=120)
+    assert all(len(p) <= 120 for p in passages)
+    assert all(p.endswith('.') for p in passages)
@@ -0,0 +1,48 @@
+import time
+from src.deadline import DeadlineScheduler, estimate_chunk_count
+
+def test_no_deadline_picks_full_quality():
+    scheduler = DeadlineScheduler()
+    assert scheduler.choose_whisper_model(3 * 3600) == 'base'
+    assert scheduler.choose_summarization(500000) == 'abstractive'
+    assert scheduler.should_translate()
+
+def test_generous_budget_keeps_full_quality():
+    scheduler = DeadlineScheduler(time.monotonic() + 3600)
+    assert scheduler.choose_whisper_model(600) == 'base'
+    assert scheduler.choose_summarization(9000) == 'abstractive'
+    assert scheduler.should_translate()
+
+def test_tight_budget_degrades_expensive_stages_first():
+    # A 10 minute video needs ~300s of Whisper base but only ~90s of tiny
+    scheduler = DeadlineScheduler(time.monotonic() + 120)
+    assert scheduler.choose_whisper_model(600) == 'tiny'
+    assert scheduler.choose_summarization(40000) == 'extractive'
+    assert scheduler.choose_summarization(500) == 'abstractive'
+    assert scheduler.should_translate()
+
+def test_passed_deadline_picks_cheapest_tiers():
+    scheduler = DeadlineScheduler(time.monotonic() - 1)
+    assert scheduler.remaining() < 0
+    assert scheduler.choose_whisper_model(10) == 'tiny'
+    assert scheduler.choose_summarization(100) == 'extractive'
+    assert not scheduler.should_translate()
+
+def test_deadline_is_absolute():
+    deadline_at = time.monotonic() + 100
+    scheduler = DeadlineScheduler(deadline_at)
+    assert 99 < scheduler.remaining() <= 100
+    assert scheduler.deadline_at == deadline_at
+
+def test_degraded_reflects_recorded_tiers():
+    scheduler = DeadlineScheduler()
+    scheduler.record('transcript', 'whisper-base')
+    scheduler.record('summarization', 'abstractive')
+    assert not scheduler.degraded
+    scheduler.record('translation', 'skipped')
+    assert scheduler.degraded
+    assert scheduler.tiers == {'transcript': 'whisper-base', 'summarization': 'abstractive', 'translation': 'skipped'}
+
+def test_estimate_chunk_count_includes_merge_call():
+    assert estimate_chunk_count(100) == 1
+    assert estimate_chunk_count(1800) == 3
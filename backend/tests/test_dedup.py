@@ -0,0 +1,48 @@
+import random
+import numpy as np
+from src.utils.dedup import dedup_chunks, minhash_signatures
+
+def _text(rng, words=180):
+    return ' '.join(f"w{rng.randrange(5000)}" for _ in range(words)) + '.'
+
+def test_signatures_are_deterministic_and_shaped():
+    texts = ["the quick brown fox jumps over the lazy dog", "", "short"]
+    first = minhash_signatures(texts, num_perm=32)
+    assert first.shape == (3, 32)
+    assert np.array_equal(first, minhash_signatures(texts, num_perm=32))
+
+def test_signature_agreement_tracks_jaccard():
+    rng = random.Random(0)
+    base = _text(rng).split()
+    near = list(base)
+    near[90] = 'changed'
+    unrelated = _text(rng).split()
+    sigs = minhash_signatures([' '.join(base), ' '.join(near), ' '.join(unrelated)], num_perm=128)
+    assert (sigs[0] == sigs[1]).mean() > 0.8
+    assert (sigs[0] == sigs[2]).mean() < 0.1
+
+def test_near_duplicates_are_dropped_in_favour_of_first_occurrence():
+    rng = random.Random(1)
+    a, b = _text(rng), _text(rng)
+    a_variant = a.replace(a.split()[50], 'edited', 1)
+    kept, stats = dedup_chunks([a, b, a_variant, a])
+    assert kept == [a, b]
+    assert stats['calls_saved'] == 2
+    assert stats['duplicates'] == {2: 0, 3: 0}
+
+def test_distinct_chunks_are_all_kept():
+    rng = random.Random(2)
+    chunks = [_text(rng) for _ in range(200)]
+    kept, stats = dedup_chunks(chunks)
+    assert kept == chunks
+    assert stats['calls_saved'] == 0
+
+def test_merge_appends_new_sentences_to_representative():
+    rep = "Alpha beta gamma delta epsilon zeta. Eta theta iota kappa lambda mu."
+    dup = rep + " A brand new closing sentence."
+    kept, stats = dedup_chunks([rep, dup], threshold=0.5, merge=True)
+    assert kept == [rep + " A brand new closing sentence."]
+    assert stats['kept_chunks'] == 1
+
+def test_single_chunk_is_returned_unchanged():
+    assert dedup_chunks(["only one"]) == (["only one"], {'input_chunks': 1, 'kept_chunks': 1, 'calls_saved': 0, 'duplicates': {}})
@@ -0,0 +1,66 @@
+import threading
+import time
+import pytest
+from src.utils.inference_server import MicroBatcher
+
+class RecordingBatchFn:
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def __call__(self, items):
+        with self._lock:
+            self.batches.append(list(items))
+        if self.fail_on is not None and self.fail_on in items:
+            raise ValueError(f"bad item {self.fail_on}")
+        return [item * 10 for item in items]
+
+def test_map_preserves_order():
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=20)
+    assert batcher.map(list(range(10))) == [i * 10 for i in range(10)]
+
+def test_batches_never_exceed_max_batch_size():
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=3, max_wait_ms=50)
+    batcher.map(list(range(10)))
+    assert max(len(batch) for batch in batch_fn.batches) <= 3
+    assert sorted(item for batch in batch_fn.batches for item in batch) == list(range(10))
+    # Everything was queued at once, so batches should be full apart from the last one
+    assert len(batch_fn.batches) == 4
+
+def test_partial_batch_is_flushed_after_max_wait():
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=50)
+    start = time.monotonic()
+    assert batcher.submit(1).result(timeout=2) == 10
+    assert time.monotonic() - start < 1.0
+    assert batch_fn.batches == [[1]]
+
+def test_requests_from_concurrent_callers_share_a_batch():
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=200)
+    results = {}
+    def call(i):
+        results[i] = batcher.submit(i).result(timeout=2)
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {i: i * 10 for i in range(4)}
+    assert len(batch_fn.batches) < 4
+
+def test_failing_item_fails_alone():
+    batch_fn = RecordingBatchFn(fail_on=2)
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(4)]
+    with pytest.raises(ValueError, match="bad item 2"):
+        futures[2].result(timeout=2)
+    assert [futures[i].result(timeout=2) for i in (0, 1, 3)] == [0, 10, 30]
+
+def test_wrong_output_length_is_an_error():
+    batcher = MicroBatcher(lambda items: [], max_batch_size=1, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="returned 0 results for 1 inputs"):
+        batcher.submit(1).result(timeout=2)
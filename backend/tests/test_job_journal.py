@@ -0,0 +1,61 @@
+import threading
+import pytest
+from src.job_journal import JobJournal, VIDEO_STAGES
+
+URL = "https://www.youtube.com/watch?v=abc123"
+
+@pytest.fixture
+def journal(tmp_path):
+    return JobJournal.create([URL], 'fr', False, job_id='job1', root_dir=str(tmp_path))
+
+def test_manifest_round_trip(journal, tmp_path):
+    manifest = JobJournal.open('job1', root_dir=str(tmp_path)).manifest
+    assert manifest['video_urls'] == [URL]
+    assert manifest['target_language'] == 'fr'
+    assert manifest['use_gpu'] is False
+
+def test_open_unknown_job_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        JobJournal.open('missing', root_dir=str(tmp_path))
+
+def test_resume_sees_only_outstanding_stages(journal, tmp_path):
+    journal.save(URL, 'transcript', 'full transcript')
+    journal.save(URL, 'chunk_summaries', ['one', 'two'])
+    resumed = JobJournal.open('job1', root_dir=str(tmp_path))
+    assert resumed.load(URL, 'transcript') == 'full transcript'
+    assert resumed.load(URL, 'chunk_summaries') == ['one', 'two']
+    assert resumed.load(URL, 'summary') is None
+    assert resumed.pending_stages(URL) == ['summary', 'translation']
+    assert not resumed.is_complete(URL)
+    for stage in resumed.pending_stages(URL):
+        resumed.save(URL, stage, 'done')
+    assert resumed.is_complete(URL)
+
+def test_malformed_urls_can_be_journaled(journal):
+    for url in ["https://youtube.com/shorts/xyz", "not a url at all"]:
+        assert not journal.is_complete(url)
+        journal.save(url, 'transcript', url)
+        assert journal.load(url, 'transcript') == url
+
+def test_concurrent_saves_of_the_same_stage(journal):
+    errors = []
+    def save(i):
+        try:
+            for _ in range(50):
+                journal.save(URL, 'transcript', f"worker {i}")
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert journal.load(URL, 'transcript').startswith('worker ')
+
+def test_delete_removes_the_job(journal, tmp_path):
+    for stage in VIDEO_STAGES:
+        journal.save(URL, stage, 'x')
+    journal.delete()
+    with pytest.raises(FileNotFoundError):
+        JobJournal.open('job1', root_dir=str(tmp_path))
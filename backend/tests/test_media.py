@@ -0,0 +1,138 @@
+import os
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.utils.media import AudioCache, download_resumable
+
+BODY = bytes(range(256)) * 400
+OTHER_BODY = bytes(reversed(range(256))) * 300
+
+class StandInServer:
+    """Local HTTP stand-in for a media CDN. Supports Range requests and can misbehave on demand."""
+    def __init__(self) -> None:
+        self.requests = []
+        self.short_responses = 0
+        self.status = None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append(self.headers.get('Range'))
+                if server.status:
+                    self.send_error(server.status)
+                    return
+                start = int(self.headers['Range'].split('=')[1].rstrip('-')) if self.headers.get('Range') else 0
+                if start >= len(BODY):
+                    self.send_response(416)
+                    self.end_headers()
+                    return
+                body = BODY[start:]
+                self.send_response(206 if start else 200)
+                if start:
+                    self.send_header('Content-Range', f"bytes {start}-{len(BODY) - 1}/{len(BODY)}")
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if server.short_responses:
+                    server.short_responses -= 1
+                    body = body[:len(body) // 3]
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/audio.webm"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+@pytest.fixture
+def server():
+    stand_in = StandInServer()
+    yield stand_in
+    stand_in.httpd.shutdown()
+
+def test_download_complete_file(server, tmp_path):
+    dest = download_resumable(server.url, str(tmp_path / 'audio.webm'))
+    assert open(dest, 'rb').read() == BODY
+    assert server.requests == [None]
+
+def test_resumes_from_partial_file(server, tmp_path):
+    dest = tmp_path / 'audio.webm'
+    (tmp_path / 'audio.webm.part').write_bytes(BODY[:1000])
+    download_resumable(server.url, str(dest))
+    assert dest.read_bytes() == BODY
+    assert server.requests == ['bytes=1000-']
+
+def test_partial_file_of_another_stream_is_restarted(server, tmp_path):
+    dest = tmp_path / 'audio.webm'
+    (tmp_path / 'audio.webm.part').write_bytes(OTHER_BODY[:1000])
+    download_resumable(server.url, str(dest), expected_size=len(OTHER_BODY))
+    assert dest.read_bytes() == BODY
+    assert server.requests == ['bytes=1000-', None]
+
+def test_partial_file_of_expected_size_is_resumed(server, tmp_path):
+    dest = tmp_path / 'audio.webm'
+    (tmp_path / 'audio.webm.part').write_bytes(BODY[:1000])
+    download_resumable(server.url, str(dest), expected_size=len(BODY))
+    assert dest.read_bytes() == BODY
+    assert server.requests == ['bytes=1000-']
+
+def test_oversized_partial_file_is_restarted(server, tmp_path):
+    dest = tmp_path / 'audio.webm'
+    (tmp_path / 'audio.webm.part').write_bytes(OTHER_BODY + OTHER_BODY)
+    download_resumable(server.url, str(dest), expected_size=len(BODY))
+    assert dest.read_bytes() == BODY
+    assert server.requests == [f'bytes={2 * len(OTHER_BODY)}-', None]
+
+def test_short_body_is_resumed_not_accepted(server, tmp_path):
+    server.short_responses = 1
+    dest = tmp_path / 'audio.webm'
+    download_resumable(server.url, str(dest))
+    assert dest.read_bytes() == BODY
+    assert server.requests[0] is None and server.requests[1].startswith('bytes=')
+
+def test_short_body_on_last_attempt_keeps_part_file(server, tmp_path):
+    server.short_responses = 5
+    dest = tmp_path / 'audio.webm'
+    with pytest.raises(urllib.error.ContentTooShortError):
+        download_resumable(server.url, str(dest), retries=2)
+    assert not dest.exists()
+    assert (tmp_path / 'audio.webm.part').exists()
+
+def test_client_error_is_not_retried(server, tmp_path):
+    server.status = 404
+    with pytest.raises(urllib.error.HTTPError):
+        download_resumable(server.url, str(tmp_path / 'audio.webm'), retries=3)
+    assert len(server.requests) == 1
+
+def test_server_error_is_retried(server, tmp_path):
+    server.status = 503
+    with pytest.raises(urllib.error.HTTPError):
+        download_resumable(server.url, str(tmp_path / 'audio.webm'), retries=3)
+    assert len(server.requests) == 3
+
+def _cache_entry(cache, video_id, size=100):
+    wav = os.path.join(cache.partial_dir, f"{video_id}.wav")
+    with open(wav, 'wb') as f:
+        f.write(b'x' * size)
+    return cache.put(video_id, wav)
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=250)
+    for i in range(3):
+        path = _cache_entry(cache, f"v{i}")
+        os.utime(path, (i, i))
+        cache.release(path)
+    _cache_entry(cache, 'v3')
+    assert cache.acquire('v0') is None
+    assert cache.acquire('v2') is not None
+
+def test_cache_never_evicts_leased_audio(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=150)
+    leased = _cache_entry(cache, 'busy')
+    os.utime(leased, (0, 0))
+    cache.release(_cache_entry(cache, 'other'))
+    assert os.path.exists(leased)
+    cache.release(leased)
+    cache.release(_cache_entry(cache, 'third'))
+    assert not os.path.exists(leased)